@@ -1,197 +1,526 @@
-from flask import Flask, render_template, jsonify
+from flask import Flask, Response, abort, render_template, jsonify, request, g, has_request_context, send_from_directory
 from datetime import datetime, timedelta
-import requests
-from bs4 import BeautifulSoup
-import re
+import hashlib
 import json
+import logging
+import mimetypes
 import os
-from threading import Lock
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from threading import Lock, Thread
+
+try:
+    import fcntl
+except ImportError:
+    # Ohne fcntl (z.B. Windows) verhindert nur das Lock pro Prozess parallele Crawls
+    fcntl = None
+
+import profiling
+from crawler import crawl_site
+from logging_setup import setup_logging
+from venues import VENUES, WEEKDAY_NAMES, get_venue, load_venues_file
+
+setup_logging()
+logger = logging.getLogger('nippes')
 
 app = Flask(__name__, static_folder='static', static_url_path='/static')
+profiling.init_app(app)
 
-# Cache-Datei für geschlossene Daten
+# Gebaute Assets aus build_assets.py (gehashte Dateinamen, vorkomprimiert)
+ASSET_DIR = os.path.join(app.static_folder, 'dist')
+ASSET_MAX_AGE = 365 * 24 * 60 * 60  # Ein Jahr, der Hash im Dateinamen ändert sich mit dem Inhalt
+
+def load_asset_manifest():
+    """Lädt die Zuordnung logischer Asset-Namen zu gehashten URLs."""
+    try:
+        with open(os.path.join(ASSET_DIR, 'asset-manifest.json'), 'r', encoding='utf-8') as f:
+            return json.load(f)
+    except FileNotFoundError:
+        logger.warning("Keine gebauten Assets gefunden (build_assets.py), verwende static/")
+    except Exception as e:
+        logger.error("Fehler beim Laden des Asset-Manifests: %s", e)
+    return {}
+
+ASSETS = load_asset_manifest()
+# Nur Dateien mit Content-Hash im Namen dürfen unveränderlich gecacht werden
+HASHED_ASSETS = {url.rsplit('/', 1)[-1] for url in ASSETS.values()}
+
+@app.template_global()
+def asset_url(name):
+    """URL eines Assets; ohne Build wird auf die ungehashte Datei in static/ zurückgegriffen."""
+    return ASSETS.get(name, f'/static/{name}')
+
+# Cache-Datei für geschlossene Daten (weitere Venues: closed_dates_cache_<slug>.json daneben)
 CACHE_FILE = '/root/nippes/closed_dates_cache.json'
-CACHE_LOCK = Lock()
-CACHE_DURATION_HOURS = 24  # Cache für 24 Stunden
+SNAPSHOT_CHECK_SECONDS = 5  # Wie oft die Cache-Datei auf Änderungen anderer Worker geprüft wird
+SCHEDULER_TICK_SECONDS = 60  # Wie oft der Scheduler nach fälligen Crawls schaut
+SCHEDULER_MAX_WORKERS = 4  # Maximale Anzahl parallel gecrawlter Venues
+
+# Im Speicher gehaltene Snapshots pro Venue: slug -> (closed_dates, last_update, mtime der Cache-Datei).
+# Mit gunicorn preload_app werden sie vor dem Fork im Master befüllt und von allen
+# Workern copy-on-write geteilt.
+_snapshots = {}
+_snapshot_checked = {}
+CACHE_LOCKS = {}
+# Vorberechnete Antworten: (slug, name) -> ((Tag, last_update), Body, ETag)
+_responses = {}
+# Zeitpunkt, zu dem warm_up() abgeschlossen wurde (für /ready)
+WARMUP_FINISHED = None
+
+load_venues_file()
 
-def crawl_closed_dates():
-    """Crawlt die Nippes-Website und extrahiert alle Daten mit geschlossenen Gesellschaften."""
+def cache_file(venue):
+    """Pfad der Cache-Datei einer Venue."""
+    if venue.slug == 'nippes':
+        return CACHE_FILE
+    return os.path.join(os.path.dirname(CACHE_FILE), f'closed_dates_cache_{venue.slug}.json')
+
+def cache_lock(venue):
+    """Lock, das parallele Crawls derselben Venue im Prozess verhindert."""
+    return CACHE_LOCKS.setdefault(venue.slug, Lock())
+
+@contextmanager
+def crawl_lock(venue, blocking=True):
+    """
+    Dateisperre neben der Cache-Datei, damit nicht mehrere Worker dieselbe Venue gleichzeitig crawlen.
+
+    Liefert False, wenn ohne ``blocking`` bereits ein anderer Prozess crawlt.
+    """
     try:
-        url = "https://www.nippes-muenster.de/"
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        closed_dates = set()
-        
-        # Suche nach Datumsangaben im Format DD.MM.YY gefolgt von "geschlossene Gesellschaft"
-        # Die geschlossenen Gesellschaften stehen in der Liste der Veranstaltungen
-        text = soup.get_text()
-        
-        # Pattern für Datum gefolgt von "geschlossene Gesellschaft"
-        # Format: DD.MM.YY geschlossene Gesellschaft
-        pattern = r'(\d{2})\.(\d{2})\.(\d{2})\s+geschlossene\s+gesellschaft'
-        matches = re.finditer(pattern, text, re.IGNORECASE)
-        
-        # Konvertiere gefundene Daten zu datetime-Objekten
-        for match in matches:
-            day, month, year = match.groups()
-            # Jahr interpretieren (YY -> 20YY)
-            full_year = 2000 + int(year)
-            try:
-                date_obj = datetime(full_year, int(month), int(day))
-                closed_dates.add(date_obj.date())
-            except ValueError:
-                # Ungültiges Datum überspringen
-                continue
-        
-        # Auch nach einzelnen "geschlossen" Einträgen suchen (z.B. "31.12.25 geschlossen - Silvester")
-        pattern_closed = r'(\d{2})\.(\d{2})\.(\d{2})\s+geschlossen'
-        matches_closed = re.finditer(pattern_closed, text, re.IGNORECASE)
-        
-        for match in matches_closed:
-            day, month, year = match.groups()
-            full_year = 2000 + int(year)
-            try:
-                date_obj = datetime(full_year, int(month), int(day))
-                closed_dates.add(date_obj.date())
-            except ValueError:
-                continue
-        
-        return closed_dates
+        lock_file = open(cache_file(venue) + '.lock', 'a') if fcntl is not None else None
+    except OSError as e:
+        logger.warning("Crawl-Sperre nicht verfügbar: %s", e, extra={'venue': venue.slug, 'rate_limit': 300})
+        lock_file = None
+    if lock_file is None:
+        yield True
+        return
+    with lock_file:
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+        except BlockingIOError:
+            yield False
+            return
+        try:
+            yield True
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def crawl_closed_dates(venue=None):
+    """
+    Crawlt die Website einer Venue samt Programmseiten und extrahiert alle Daten mit geschlossenen Gesellschaften.
+
+    Liefert None, wenn der Crawl fehlschlägt; eine leere Menge heißt dagegen
+    "keine geschlossenen Gesellschaften".
+    """
+    venue = venue or get_venue()
+    try:
+        return crawl_site(venue.start_url, extractor=venue.extractor, keywords=venue.keywords)
     except Exception as e:
-        print(f"Fehler beim Crawlen der Website: {e}")
-        return set()
+        logger.error("Fehler beim Crawlen der Website: %s", e, extra={'venue': venue.slug, 'rate_limit': 300})
+        return None
 
-def load_cached_dates():
+def load_cached_dates(venue=None):
     """Lädt gecachte geschlossene Daten aus der Datei."""
+    venue = venue or get_venue()
     try:
-        if os.path.exists(CACHE_FILE):
-            with open(CACHE_FILE, 'r', encoding='utf-8') as f:
+        path = cache_file(venue)
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
                 cache_data = json.load(f)
                 cache_time = datetime.fromisoformat(cache_data['timestamp'])
-                # Prüfe, ob Cache noch gültig ist (weniger als 24 Stunden alt)
-                if datetime.now() - cache_time < timedelta(hours=CACHE_DURATION_HOURS):
+                # Prüfe, ob Cache noch gültig ist (jünger als das Crawl-Intervall der Venue)
+                if datetime.now() - cache_time < timedelta(hours=venue.crawl_interval_hours):
                     # Konvertiere String-Daten zurück zu date-Objekten
                     dates = [datetime.fromisoformat(d).date() for d in cache_data['dates']]
                     return set(dates), cache_time
     except Exception as e:
-        print(f"Fehler beim Laden des Caches: {e}")
+        logger.warning("Fehler beim Laden des Caches: %s", e, extra={'venue': venue.slug, 'rate_limit': 60})
     return None, None
 
-def save_cached_dates(closed_dates):
+def save_cached_dates(closed_dates, venue=None):
     """Speichert geschlossene Daten in der Cache-Datei."""
+    venue = venue or get_venue()
     try:
         cache_data = {
             'timestamp': datetime.now().isoformat(),
             'dates': [d.isoformat() for d in closed_dates]
         }
-        with open(CACHE_FILE, 'w', encoding='utf-8') as f:
+        with open(cache_file(venue), 'w', encoding='utf-8') as f:
             json.dump(cache_data, f)
     except Exception as e:
-        print(f"Fehler beim Speichern des Caches: {e}")
+        logger.error("Fehler beim Speichern des Caches: %s", e, extra={'venue': venue.slug})
 
-def get_closed_dates():
-    """Holt geschlossene Daten aus dem Cache oder crawlt neu, falls nötig."""
-    with CACHE_LOCK:
-        # Versuche Cache zu laden
-        cached_dates, cache_time = load_cached_dates()
-        
-        if cached_dates is not None:
-            print(f"Verwende gecachte Daten vom {cache_time.strftime('%Y-%m-%d %H:%M:%S')}")
-            return cached_dates, cache_time
-        
-        # Cache ist abgelaufen oder nicht vorhanden, crawle neu
-        print("Cache abgelaufen oder nicht vorhanden, crawle Website neu...")
-        closed_dates = crawl_closed_dates()
-        save_cached_dates(closed_dates)
-        now = datetime.now()
-        print(f"Neue Daten gecrawlt: {len(closed_dates)} geschlossene Termine gefunden")
-        return closed_dates, now
-
-def is_open_today(closed_dates):
-    """Prüft, ob das Nippes heute geöffnet ist."""
-    today = datetime.now().date()
-    weekday = today.weekday()  # 0 = Montag, 6 = Sonntag
-    
-    # Öffnungszeiten: Mittwoch (2) bis Samstag (5)
-    if weekday < 2 or weekday > 5:
-        return False, "Heute ist nicht Mittwoch bis Samstag"
+def cache_mtime(venue):
+    """Änderungszeit der Cache-Datei oder None, falls sie nicht existiert."""
+    try:
+        return os.path.getmtime(cache_file(venue))
+    except OSError:
+        return None
+
+def set_snapshot(venue, closed_dates, last_update, mtime=None):
+    """Ersetzt den Snapshot einer Venue im Speicher."""
+    _snapshots[venue.slug] = (closed_dates, last_update, mtime if mtime is not None else cache_mtime(venue))
+
+def snapshot_due(venue, last_update):
+    """Prüft, ob eine Venue neu gecrawlt werden soll; kurz vor Ablauf, damit Requests nie auf einen Crawl warten."""
+    if last_update is None:
+        return True
+    refresh_after = timedelta(hours=venue.crawl_interval_hours) - timedelta(seconds=2 * SCHEDULER_TICK_SECONDS)
+    return datetime.now() - last_update >= refresh_after
+
+def set_cache_state(state):
+    """Merkt sich den Cache-Status für das Request-Log."""
+    if has_request_context():
+        g.cache_state = state
+
+def get_closed_dates(venue=None):
+    """
+    Holt geschlossene Daten aus dem Snapshot im Speicher.
+
+    Ein veralteter Snapshot wird weiter ausgeliefert, bis der Scheduler ihn
+    ersetzt hat; nur ohne Snapshot wird im Request selbst gecrawlt.
+    """
+    venue = venue or get_venue()
+    snapshot = _snapshots.get(venue.slug)
+    if snapshot is None:
+        set_cache_state('crawl')
+        return refresh_venue(venue)
     
-    # Prüfe auf geschlossene Gesellschaften
-    if today in closed_dates:
-        return False, "Heute ist geschlossene Gesellschaft"
+    # Die Cache-Datei kann von einem anderen Worker (z.B. über /refresh) neu geschrieben worden sein
+    if time.monotonic() - _snapshot_checked.get(venue.slug, 0.0) >= SNAPSHOT_CHECK_SECONDS:
+        _snapshot_checked[venue.slug] = time.monotonic()
+        mtime = cache_mtime(venue)
+        if mtime is not None and mtime != snapshot[2]:
+            cached_dates, cache_time = load_cached_dates(venue)
+            if cached_dates is not None:
+                set_cache_state('hit')
+                set_snapshot(venue, cached_dates, cache_time, mtime)
+                return cached_dates, cache_time
     
-    return True, "Das Nippes ist heute geöffnet, viel Spaß damit!"
+    set_cache_state('memory')
+    return snapshot[0], snapshot[1]
 
-@app.route('/')
-def index():
-    """Hauptseite, die den Öffnungsstatus anzeigt."""
-    # Hole geschlossene Daten und Zeitstempel
-    closed_dates, last_update = get_closed_dates()
+def refresh_venue(venue, force=False):
+    """
+    Aktualisiert den Snapshot einer Venue aus der Cache-Datei oder per Crawl.
+
+    Crawlt bereits ein anderer Worker, wird dessen Ergebnis später über die
+    Cache-Datei übernommen; ohne eigenen Snapshot wird darauf gewartet.
+    """
+    with cache_lock(venue):
+        snapshot = _snapshots.get(venue.slug)
+        with crawl_lock(venue, blocking=snapshot is None) as acquired:
+            if not acquired:
+                return snapshot[0], snapshot[1]
+            
+            # Versuche Cache zu laden, ein anderer Worker hat eventuell gerade gecrawlt
+            mtime = cache_mtime(venue)
+            cached_dates, cache_time = load_cached_dates(venue)
+            if not force:
+                if cached_dates is not None and not snapshot_due(venue, cache_time):
+                    set_snapshot(venue, cached_dates, cache_time, mtime)
+                    return cached_dates, cache_time
+            
+            # Cache ist bald abgelaufen oder nicht vorhanden, crawle neu
+            logger.info("Cache abgelaufen oder nicht vorhanden, crawle Website neu...", extra={'venue': venue.slug})
+            started = time.monotonic()
+            closed_dates = crawl_closed_dates(venue)
+            if closed_dates is None:
+                # Fehlgeschlagenen Crawl nicht als Daten veröffentlichen: bisherigen Snapshot behalten,
+                # der Scheduler versucht es beim nächsten Tick erneut. Eine noch gültige Cache-Datei
+                # (z.B. nach einem Neustart kurz vor Ablauf) ist besser als gar keine Daten.
+                if cached_dates is not None and (snapshot is None or snapshot[1] is None or cache_time > snapshot[1]):
+                    set_snapshot(venue, cached_dates, cache_time, mtime)
+                    return cached_dates, cache_time
+                if snapshot is None:
+                    set_snapshot(venue, set(), None, None)
+                    return set(), None
+                return snapshot[0], snapshot[1]
+            save_cached_dates(closed_dates, venue)
+            now = datetime.now()
+            set_snapshot(venue, closed_dates, now)
+            logger.info("Neue Daten gecrawlt: %d geschlossene Termine gefunden", len(closed_dates),
+                        extra={'venue': venue.slug, 'latency_ms': round((time.monotonic() - started) * 1000)})
+            return closed_dates, now
+
+class CrawlScheduler:
+    """
+    Hält die Snapshots aller Venues aktuell.
+
+    Fällige Venues (Snapshot fehlt oder läuft in den nächsten zwei Ticks ab)
+    werden parallel gecrawlt, sodass Requests nur den Snapshot im Speicher
+    lesen und nie auf einen Crawl warten.
+    """
+    
+    def __init__(self, max_workers=SCHEDULER_MAX_WORKERS, tick=SCHEDULER_TICK_SECONDS):
+        self.max_workers = max_workers
+        self.tick = tick
+        self.pid = None
+        self.lock = Lock()
     
+    def due_venues(self):
+        """Alle Venues, deren Snapshot fehlt oder demnächst abläuft."""
+        due = []
+        for venue in VENUES.values():
+            snapshot = _snapshots.get(venue.slug)
+            if snapshot is None or snapshot_due(venue, snapshot[1]):
+                due.append(venue)
+        return due
+    
+    def refresh_due(self):
+        """Aktualisiert alle fälligen Venues parallel und wartet auf das Ergebnis."""
+        due = self.due_venues()
+        if not due:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(due))) as executor:
+            list(executor.map(refresh_venue, due))
+        return len(due)
+    
+    def run(self):
+        while True:
+            time.sleep(self.tick)
+            try:
+                self.refresh_due()
+            except Exception:
+                logger.exception("Fehler im Crawl-Scheduler", extra={'rate_limit': 300})
+    
+    def start(self):
+        """Startet den Hintergrund-Thread; nach einem Fork einmal pro Prozess."""
+        if self.pid == os.getpid():
+            return
+        with self.lock:
+            if self.pid == os.getpid():
+                return
+            self.pid = os.getpid()
+            Thread(target=self.run, name='crawl-scheduler', daemon=True).start()
+
+scheduler = CrawlScheduler()
+
+def is_open_today(closed_dates, venue=None):
+    """Prüft, ob die Venue (Standard: Nippes) heute geöffnet ist."""
+    venue = venue or get_venue()
+    return venue.is_open(datetime.now().date(), closed_dates)
+
+def render_index(venue, closed_dates, last_update):
+    """Rendert die Hauptseite für den aktuellen Tag."""
     # Prüfe Öffnungsstatus
-    is_open, message = is_open_today(closed_dates)
+    is_open, message = is_open_today(closed_dates, venue)
     
     # Hole auch die nächsten geschlossenen Termine für Info
     today = datetime.now().date()
     upcoming_closed = sorted([d for d in closed_dates if d >= today])[:5]
     
     return render_template('index.html', 
+                         venue=venue,
                          is_open=is_open, 
                          message=message,
                          upcoming_closed=upcoming_closed,
                          last_update=last_update)
 
+def render_status(venue, closed_dates, last_update):
+    """Erzeugt den JSON-Body für /api/status für den aktuellen Tag."""
+    is_open, message = is_open_today(closed_dates, venue)
+    
+    today = datetime.now().date()
+    weekday = today.weekday()
+    
+    # Formatiere die Antwort für Chat-Bots
+    emoji = "🍺" if is_open else "😢"
+    status_text = f"{emoji} {message}"
+    
+    # Füge zusätzliche Infos hinzu
+    response = {
+        'venue': venue.slug,
+        'is_open': is_open,
+        'message': status_text,
+        'day': WEEKDAY_NAMES[weekday],
+        'last_update': last_update.strftime('%d.%m.%Y %H:%M') if last_update else None,
+        # False, solange noch kein Crawl erfolgreich war (closed_dates ist dann nicht aussagekräftig)
+        'crawl_ok': last_update is not None
+    }
+    
+    # Prüfe auf kommende geschlossene Termine
+    upcoming_closed = sorted([d for d in closed_dates if d >= today])[:3]
+    if upcoming_closed:
+        response['upcoming_closed'] = [d.strftime('%d.%m.%Y') for d in upcoming_closed]
+    
+    # Vollständige Liste für Änderungserkennung (z.B. Broadcasts des Talk-Bots)
+    response['closed_dates'] = [d.strftime('%d.%m.%Y') for d in sorted(d for d in closed_dates if d >= today)]
+    
+    return app.json.dumps(response)
+
+def precomputed(venue, name, builder):
+    """Liefert eine vorberechnete Antwort (Body, ETag); sie wird pro Venue, Tag und Snapshot nur einmal erzeugt."""
+    closed_dates, last_update = get_closed_dates(venue)
+    key = (venue.slug, name)
+    stamp = (datetime.now().date(), last_update)
+    entry = _responses.get(key)
+    if entry is None or entry[0] != stamp:
+        body = builder(venue, closed_dates, last_update)
+        entry = (stamp, body, hashlib.sha256(body.encode('utf-8')).hexdigest()[:16])
+        _responses[key] = entry
+    return entry[1], entry[2]
+
+def conditional_response(venue, name, builder, mimetype):
+    """Vorberechnete Antwort mit ETag; bei passendem If-None-Match nur 304 ohne Body."""
+    body, etag = precomputed(venue, name, builder)
+    response = Response(body, mimetype=mimetype)
+    response.set_etag(etag)
+    # Immer beim Server nachfragen, der Status kann sich mit dem Tag ändern
+    response.headers['Cache-Control'] = 'no-cache'
+    return response.make_conditional(request)
+
+def venue_or_404(slug):
+    """Liefert die Venue zum Slug oder bricht mit 404 ab."""
+    venue = get_venue(slug)
+    if venue is None:
+        abort(404)
+    return venue
+
+def warm_up():
+    """
+    Baut Snapshots, kompiliertes Template und vorberechnete Antworten auf.
+
+    Wird von gunicorn.conf.py im Master vor dem Fork aufgerufen, damit alle
+    Worker ab dem ersten Request ohne Crawl und ohne Template-Kompilierung
+    antworten. Die Venues werden dabei parallel gecrawlt.
+    """
+    global WARMUP_FINISHED
+    started = time.monotonic()
+    app.jinja_env.get_template('index.html')
+    scheduler.refresh_due()
+    with app.test_request_context('/'):
+        for venue in VENUES.values():
+            precomputed(venue, 'index', render_index)
+            precomputed(venue, 'api_status', render_status)
+    WARMUP_FINISHED = datetime.now()
+    logger.info("Warm-up abgeschlossen", extra={
+        'venues': len(VENUES),
+        'latency_ms': round((time.monotonic() - started) * 1000),
+    })
+
+@app.before_request
+def start_timer():
+    g.request_start = time.monotonic()
+
+@app.before_request
+def ensure_scheduler():
+    # Startet den Scheduler auch ohne gunicorn.conf.py (z.B. flask run), sonst veralten die Snapshots
+    scheduler.start()
+
+@app.after_request
+def log_request(response):
+    """Loggt jeden Request auf DEBUG mit Route, Latenz und Cache-Status."""
+    if logger.isEnabledFor(logging.DEBUG):
+        latency_ms = (time.monotonic() - g.get('request_start', time.monotonic())) * 1000
+        logger.debug("Request", extra={
+            'route': request.path,
+            'status': response.status_code,
+            'latency_ms': f'{latency_ms:.1f}',
+            'cache': g.get('cache_state', '-'),
+        })
+    return response
+
+@app.route('/')
+@app.route('/venues/<venue>')
+def index(venue=None):
+    """Hauptseite, die den Öffnungsstatus anzeigt (ohne Venue: Nippes)."""
+    return conditional_response(venue_or_404(venue), 'index', render_index, 'text/html')
+
 @app.route('/api/status')
-def api_status():
+@app.route('/api/status/<venue>')
+def api_status(venue=None):
     """API-Endpoint für Bots (z.B. Nextcloud Talk Bot)."""
+    slug, venue = venue, get_venue(venue)
+    if venue is None:
+        return jsonify({
+            'is_open': False,
+            'message': f'Unbekannte Venue: {slug}'
+        }), 404
     try:
-        closed_dates, last_update = get_closed_dates()
-        is_open, message = is_open_today(closed_dates)
-        
-        today = datetime.now().date()
-        weekday = today.weekday()
-        weekday_names = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
-        
-        # Formatiere die Antwort für Chat-Bots
-        emoji = "🍺" if is_open else "😢"
-        status_text = f"{emoji} {message}"
-        
-        # Füge zusätzliche Infos hinzu
-        response = {
-            'is_open': is_open,
-            'message': status_text,
-            'day': weekday_names[weekday],
-            'last_update': last_update.strftime('%d.%m.%Y %H:%M') if last_update else None
-        }
-        
-        # Prüfe auf kommende geschlossene Termine
-        upcoming_closed = sorted([d for d in closed_dates if d >= today])[:3]
-        if upcoming_closed:
-            response['upcoming_closed'] = [d.strftime('%d.%m.%Y') for d in upcoming_closed]
-        
-        return jsonify(response), 200
+        return conditional_response(venue, 'api_status', render_status, 'application/json')
     except Exception as e:
+        logger.exception("Fehler beim Abrufen des Status")
         return jsonify({
             'is_open': False,
             'message': f'Fehler beim Abrufen des Status: {str(e)}'
         }), 500
 
+@app.route('/assets/<path:filename>')
+def assets(filename):
+    """Liefert gehashte Assets unveränderlich gecacht und, wenn möglich, vorkomprimiert aus."""
+    # sw.js, asset-manifest.json und alte Dateien ohne Manifest-Eintrag gehören nicht hierher
+    if filename not in HASHED_ASSETS:
+        abort(404)
+    mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+    for encoding, suffix in (('br', '.br'), ('gzip', '.gz')):
+        if request.accept_encodings[encoding] > 0 and os.path.isfile(os.path.join(ASSET_DIR, filename + suffix)):
+            response = send_from_directory(ASSET_DIR, filename + suffix, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+            response.headers['Content-Encoding'] = encoding
+            break
+    else:
+        response = send_from_directory(ASSET_DIR, filename, mimetype=mimetype, max_age=ASSET_MAX_AGE)
+    response.headers['Cache-Control'] = f'public, max-age={ASSET_MAX_AGE}, immutable'
+    response.headers['Vary'] = 'Accept-Encoding'
+    return response
+
+@app.route('/sw.js')
+def service_worker():
+    """Service Worker im Root-Scope; die gebaute Version enthält Cache-Version und Precache-Liste."""
+    directory = ASSET_DIR if os.path.isfile(os.path.join(ASSET_DIR, 'sw.js')) else app.static_folder
+    response = send_from_directory(directory, 'sw.js', mimetype='application/javascript', max_age=0)
+    # Der Browser soll Updates des Service Workers sofort sehen
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+@app.route('/api/venues')
+def api_venues():
+    """Liste aller registrierten Venues."""
+    return jsonify([{
+        'slug': venue.slug,
+        'name': venue.name,
+        'website': venue.website,
+        'opening_hours': venue.opening_hours,
+        'status_url': f'/api/status/{venue.slug}',
+    } for venue in VENUES.values()])
+
+@app.route('/ready')
+def ready():
+    """
+    Readiness-Check dieses Workers: 200, sobald für alle Venues ein Snapshot im Speicher liegt.
+
+    Unter gunicorn läuft das Warm-up vor dem Fork, die Worker nehmen also erst
+    danach Verbindungen an und antworten sofort mit 200. Ohne Warm-up (z.B.
+    ``flask run``) kommt 503, bis die Snapshots gecrawlt sind.
+    """
+    missing = [slug for slug in VENUES if slug not in _snapshots]
+    if missing:
+        return {'status': 'warming_up', 'missing': missing}, 503
+    return {
+        'status': 'ready',
+        'warmed_up': WARMUP_FINISHED.isoformat() if WARMUP_FINISHED else None,
+    }, 200
+
 @app.route('/refresh')
-def refresh_cache():
+@app.route('/refresh/<venue>')
+def refresh_cache(venue=None):
     """Manueller Endpoint zum Neuladen des Caches."""
+    slug, venue = venue, get_venue(venue)
+    if venue is None:
+        return {
+            'status': 'error',
+            'message': f'Unbekannte Venue: {slug}'
+        }, 404
     try:
-        # Lösche Cache-Datei, damit beim nächsten Aufruf neu gecrawlt wird
-        if os.path.exists(CACHE_FILE):
-            os.remove(CACHE_FILE)
-        
-        # Crawle sofort neu
-        closed_dates = crawl_closed_dates()
-        save_cached_dates(closed_dates)
+        # Crawle sofort neu, unabhängig vom Alter der Cache-Datei
+        started = datetime.now()
+        closed_dates, last_update = refresh_venue(venue, force=True)
+        if last_update is None or last_update < started:
+            return {
+                'status': 'error',
+                'message': 'Crawl fehlgeschlagen, die bisherigen Daten bleiben erhalten.'
+            }, 502
         
         return {
             'status': 'success',
@@ -199,11 +528,13 @@ def refresh_cache():
             'timestamp': datetime.now().isoformat()
         }, 200
     except Exception as e:
+        logger.exception("Fehler beim Aktualisieren des Caches")
         return {
             'status': 'error',
             'message': f'Fehler beim Aktualisieren: {str(e)}'
         }, 500
 
 if __name__ == '__main__':
+    warm_up()
+    scheduler.start()
     app.run(debug=True, host='0.0.0.0', port=5001)
-
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Baut die statischen Assets für die Nippes-App.
+
+Erzeugt in static/dist/:
+- PWA-Icons mit Bier-Emoji als optimierte PNG- und WebP-Dateien sowie ein
+  minifiziertes SVG-Icon
+- manifest.json mit auf die neuen Icons umgeschriebenen Pfaden
+- für alle Dateien Namen mit Content-Hash (z.B. icon-192.3f2a9c01de.png),
+  die die App mit "Cache-Control: immutable" ausliefert
+- für Text-Assets vorkomprimierte .gz- und (falls brotli installiert ist)
+  .br-Varianten
+- asset-manifest.json, über das die App logische Namen
+  (z.B. "icon-192.png") in die gehashten URLs übersetzt
+- sw.js mit aus dem Build abgeleiteter Cache-Version und der Liste der
+  gehashten Assets zum Precachen (ungehasht, da die URL stabil sein muss)
+
+Pillow (Icons, WebP) und brotli (.br-Dateien) stehen in requirements.txt.
+Fehlen sie, z.B. in einer Entwicklungsumgebung, werden die vorhandenen
+PNG-Icons aus static/ übernommen und nur .gz-Varianten erzeugt.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+import re
+import sys
+from io import BytesIO
+
+try:
+    from PIL import Image, ImageDraw, ImageFont
+    HAS_PILLOW = True
+except ImportError:
+    HAS_PILLOW = False
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+STATIC_DIR = os.path.join(BASE_DIR, 'static')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+ASSET_MANIFEST = os.path.join(DIST_DIR, 'asset-manifest.json')
+ASSET_URL_PREFIX = '/assets/'
+
+ICON_SIZES = [192, 512]
+ICON_COLOR = (102, 126, 234, 255)  # #667eea
+EMOJI_FONTS = [
+    # macOS
+    "/System/Library/Fonts/Apple Color Emoji.ttc",
+    # Linux
+    "/usr/share/fonts/truetype/noto/NotoColorEmoji.ttf",
+]
+COMPRESSIBLE = ('.svg', '.json', '.js', '.css', '.html')
+
+def create_icon(size):
+    """Erstellt ein PNG-Icon mit Bier-Emoji (Pillow)."""
+    img = Image.new('RGBA', (size, size), ICON_COLOR)
+    draw = ImageDraw.Draw(img)
+
+    font_size = int(size * 0.6)
+    font = None
+    for path in EMOJI_FONTS:
+        try:
+            font = ImageFont.truetype(path, font_size)
+            break
+        except Exception:
+            continue
+    if font is None:
+        font = ImageFont.load_default()
+
+    text = "🍺"
+    # Berechne Position für zentriertes Emoji
+    bbox = draw.textbbox((0, 0), text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    position = ((size - text_width) // 2, (size - text_height) // 2)
+
+    draw.text(position, text, font=font, fill=(255, 255, 255, 255), embedded_color=True)
+    return img
+
+def create_svg_icon():
+    """Erstellt ein skalierbares SVG-Icon mit Bier-Emoji."""
+    return '''<svg xmlns="http://www.w3.org/2000/svg" viewBox="0 0 100 100">
+  <rect width="100" height="100" fill="#667eea"/>
+  <text x="50%" y="50%" font-size="60" text-anchor="middle" dominant-baseline="central">🍺</text>
+</svg>
+'''
+
+def minify_svg(svg):
+    """Entfernt Kommentare und überflüssigen Whitespace aus einem SVG."""
+    svg = re.sub(r'<!--.*?-->', '', svg, flags=re.DOTALL)
+    svg = re.sub(r'>\s+<', '><', svg)
+    return re.sub(r'\s+', ' ', svg).strip()
+
+def encode_image(img, fmt):
+    """Speichert ein Bild optimiert im gewünschten Format und liefert die Bytes."""
+    buffer = BytesIO()
+    if fmt == 'PNG':
+        img.save(buffer, 'PNG', optimize=True)
+    else:
+        img.save(buffer, 'WEBP', lossless=True, method=6)
+    return buffer.getvalue()
+
+def write_asset(name, data, assets):
+    """Schreibt ein Asset mit Content-Hash im Namen und trägt es ins Asset-Manifest ein."""
+    stem, ext = os.path.splitext(name)
+    digest = hashlib.sha256(data).hexdigest()[:10]
+    hashed_name = f'{stem}.{digest}{ext}'
+    path = os.path.join(DIST_DIR, hashed_name)
+    with open(path, 'wb') as f:
+        f.write(data)
+
+    # Vorkomprimierte Varianten nur für Text-Assets, Bilder sind bereits komprimiert
+    if ext in COMPRESSIBLE:
+        with open(path + '.gz', 'wb') as f:
+            f.write(gzip.compress(data, compresslevel=9, mtime=0))
+        if brotli is not None:
+            with open(path + '.br', 'wb') as f:
+                f.write(brotli.compress(data, quality=11))
+
+    assets[name] = ASSET_URL_PREFIX + hashed_name
+    print(f'Asset erstellt: {hashed_name}')
+    return assets[name]
+
+def build_icons(assets):
+    """Erzeugt die Icons und liefert die Einträge für manifest.json."""
+    manifest_icons = []
+    for size in ICON_SIZES:
+        name = f'icon-{size}.png'
+        if HAS_PILLOW:
+            icon = create_icon(size)
+            png = encode_image(icon, 'PNG')
+        else:
+            with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+                png = f.read()
+        url = write_asset(name, png, assets)
+        manifest_icons.append({'src': url, 'sizes': f'{size}x{size}', 'type': 'image/png', 'purpose': 'any maskable'})
+
+    if HAS_PILLOW:
+        for size in ICON_SIZES:
+            url = write_asset(f'icon-{size}.webp', encode_image(create_icon(size), 'WEBP'), assets)
+            manifest_icons.append({'src': url, 'sizes': f'{size}x{size}', 'type': 'image/webp', 'purpose': 'any maskable'})
+
+    url = write_asset('icon.svg', minify_svg(create_svg_icon()).encode('utf-8'), assets)
+    manifest_icons.append({'src': url, 'sizes': 'any', 'type': 'image/svg+xml', 'purpose': 'any'})
+    return manifest_icons
+
+def build_manifest(icons, assets):
+    """Schreibt manifest.json mit den gehashten Icon-Pfaden."""
+    with open(os.path.join(STATIC_DIR, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    manifest['icons'] = icons
+    data = json.dumps(manifest, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+    write_asset('manifest.json', data, assets)
+
+def build_service_worker(assets):
+    """Setzt Cache-Version und Precache-Liste in den Service Worker ein."""
+    with open(os.path.join(STATIC_DIR, 'sw.js'), 'r', encoding='utf-8') as f:
+        source = f.read()
+    # Neue Version, sobald sich ein Asset oder der Service Worker selbst ändert
+    version = hashlib.sha256((json.dumps(assets, sort_keys=True) + source).encode('utf-8')).hexdigest()[:10]
+    source = source.replace("/*__BUILD_VERSION__*/'dev'", json.dumps(version))
+    source = source.replace("/*__PRECACHE_URLS__*/[]", json.dumps(sorted(assets.values())))
+    with open(os.path.join(DIST_DIR, 'sw.js'), 'w', encoding='utf-8') as f:
+        f.write(source)
+    print(f'Service Worker erstellt: sw.js (Cache-Version {version})')
+
+def main():
+    """Hauptfunktion zum Bauen der Assets."""
+    if not HAS_PILLOW:
+        print("WARNUNG: Pillow nicht verfügbar, übernehme vorhandene PNG-Icons ohne WebP. "
+              "Installiere mit: pip install -r requirements.txt", file=sys.stderr)
+    if brotli is None:
+        print("WARNUNG: brotli nicht verfügbar, erstelle nur .gz-Varianten. "
+              "Installiere mit: pip install -r requirements.txt", file=sys.stderr)
+
+    # Alte Hash-Dateien bleiben liegen, damit noch laufende Worker sie bis zum Neustart ausliefern können
+    os.makedirs(DIST_DIR, exist_ok=True)
+
+    assets = {}
+    icons = build_icons(assets)
+    build_manifest(icons, assets)
+
+    build_service_worker(assets)
+
+    with open(ASSET_MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(assets, f, indent=2, sort_keys=True)
+    print(f'Asset-Manifest erstellt: {ASSET_MANIFEST} ({len(assets)} Assets)')
+
+if __name__ == '__main__':
+    main()
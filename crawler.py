@@ -0,0 +1,202 @@
+"""
+Crawler für die Websites der Venues (Standard: Nippes).
+
+Findet ausgehend von der Startseite die Programm- und Veranstaltungsseiten
+und lädt sie parallel über eine gemeinsame Keep-Alive-Session. Die Anzahl
+gleichzeitiger Requests ist begrenzt, pro Host wird ein Mindestabstand
+zwischen zwei Requests eingehalten und der gesamte Crawl hat eine Deadline.
+"""
+
+import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from datetime import datetime
+from threading import Lock
+from urllib.parse import urljoin, urldefrag, urlparse
+
+import requests
+from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+START_URL = "https://www.nippes-muenster.de/"
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36'
+}
+
+MAX_PAGES = 25          # Maximale Anzahl Seiten pro Crawl
+MAX_WORKERS = 4         # Maximale Anzahl gleichzeitiger Requests
+HOST_DELAY = 0.25       # Mindestabstand zwischen zwei Requests an denselben Host (Sekunden)
+REQUEST_TIMEOUT = 10    # Timeout pro Request (Sekunden)
+CRAWL_DEADLINE = 30     # Maximale Gesamtdauer eines Crawls (Sekunden)
+
+# Links, deren URL oder Linktext einen dieser Begriffe enthält, gehören zum Programm
+# (bewusst eng, "Startseite" oder "Homepage" sollen das Seitenbudget nicht verbrauchen)
+PAGE_KEYWORDS = ('programm', 'veranstaltung', 'termine', 'kalender', '/events', '/page/', '?page=', '&page=')
+# Links auf Dateien, die keine HTML-Seiten sind, werden gar nicht erst geladen
+SKIP_EXTENSIONS = ('.pdf', '.jpg', '.jpeg', '.png', '.gif', '.webp', '.svg', '.ics', '.zip', '.mp3', '.mp4')
+HTML_CONTENT_TYPES = ('text/html', 'application/xhtml+xml')
+
+# Pattern für Datum gefolgt von "geschlossene Gesellschaft" bzw. "geschlossen"
+# Format: DD.MM.YY geschlossene Gesellschaft / DD.MM.YY geschlossen - Silvester
+CLOSED_PATTERNS = (
+    re.compile(r'(\d{2})\.(\d{2})\.(\d{2})\s+geschlossene\s+gesellschaft', re.IGNORECASE),
+    re.compile(r'(\d{2})\.(\d{2})\.(\d{2})\s+geschlossen', re.IGNORECASE),
+)
+
+
+class HostThrottle:
+    """Sorgt für einen Mindestabstand zwischen Requests an denselben Host."""
+
+    def __init__(self, delay):
+        self.delay = delay
+        self.lock = Lock()
+        self.next_slot = {}
+
+    def wait(self, url):
+        """Blockiert, bis für den Host der URL der nächste Request erlaubt ist."""
+        host = urlparse(url).netloc
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot.get(host, now))
+            self.next_slot[host] = slot + self.delay
+        if slot > now:
+            time.sleep(slot - now)
+
+
+def create_session(pool_size=MAX_WORKERS):
+    """Erstellt eine Session mit Connection-Pool passend zur Parallelität."""
+    session = requests.Session()
+    session.headers.update(HEADERS)
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+def extract_closed_dates(text):
+    """Extrahiert alle Daten mit geschlossenen Gesellschaften aus einem Text."""
+    closed_dates = set()
+    for pattern in CLOSED_PATTERNS:
+        for match in pattern.finditer(text):
+            day, month, year = match.groups()
+            # Jahr interpretieren (YY -> 20YY)
+            full_year = 2000 + int(year)
+            try:
+                closed_dates.add(datetime(full_year, int(month), int(day)).date())
+            except ValueError:
+                # Ungültiges Datum überspringen
+                continue
+    return closed_dates
+
+
+def discover_pages(soup, page_url, start_url=START_URL, keywords=PAGE_KEYWORDS):
+    """Findet Links auf Programm- und Veranstaltungsseiten derselben Website."""
+    host = urlparse(start_url).netloc
+    found = []
+    for link in soup.find_all('a', href=True):
+        url, _ = urldefrag(urljoin(page_url, link['href']))
+        parsed = urlparse(url)
+        if parsed.scheme not in ('http', 'https') or parsed.netloc != host:
+            continue
+        if parsed.path.lower().endswith(SKIP_EXTENSIONS):
+            continue
+        haystack = f"{parsed.path}?{parsed.query} {link.get_text(' ', strip=True)}".lower()
+        if any(keyword in haystack for keyword in keywords):
+            found.append(url)
+    return found
+
+
+def fetch_page(session, throttle, url, start_url=START_URL, extractor=extract_closed_dates, keywords=PAGE_KEYWORDS,
+               end_time=None):
+    """
+    Lädt eine Seite und liefert geschlossene Daten sowie gefundene Links.
+
+    Mit ``end_time`` (time.monotonic()) wird der Timeout auf die verbleibende
+    Zeit bis zur Crawl-Deadline begrenzt.
+    """
+    throttle.wait(url)
+    timeout = REQUEST_TIMEOUT
+    if end_time is not None:
+        timeout = min(timeout, end_time - time.monotonic())
+        if timeout <= 0:
+            raise TimeoutError(f"Crawl-Deadline vor dem Request an {url} erreicht")
+    with session.get(url, timeout=timeout, stream=True) as response:
+        response.raise_for_status()
+        content_type = response.headers.get('Content-Type', 'text/html').split(';')[0].strip().lower()
+        if content_type not in HTML_CONTENT_TYPES:
+            # Keine HTML-Seite (z.B. PDF oder Bild), Body nicht laden
+            logger.debug("Überspringe %s (%s)", url, content_type)
+            return set(), []
+        soup = BeautifulSoup(response.content, 'html.parser')
+    return extractor(soup.get_text()), discover_pages(soup, response.url, start_url, keywords)
+
+
+def crawl_site(start_url=START_URL, max_pages=MAX_PAGES, max_workers=MAX_WORKERS,
+               host_delay=HOST_DELAY, deadline=CRAWL_DEADLINE,
+               extractor=extract_closed_dates, keywords=PAGE_KEYWORDS):
+    """
+    Crawlt die Startseite und alle gefundenen Programmseiten parallel.
+
+    ``extractor`` erhält den Text einer Seite und liefert die geschlossenen
+    Daten, ``keywords`` bestimmt, welchen Links gefolgt wird.
+    Die Ergebnisse aller Seiten werden zu einer Menge zusammengeführt. Schlägt
+    bereits die Startseite fehl, wird die Exception weitergereicht; Fehler auf
+    Unterseiten werden ignoriert, damit ein Teilergebnis erhalten bleibt.
+    """
+    end_time = time.monotonic() + deadline
+    throttle = HostThrottle(host_delay)
+    closed_dates = set()
+    seen = {start_url}
+
+    session = create_session(max_workers)
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = {}
+    try:
+        # Startseite synchron laden, sie ist Voraussetzung für alles Weitere
+        dates, links = fetch_page(session, throttle, start_url, start_url, extractor, keywords, end_time)
+        closed_dates |= dates
+        queue = list(links)
+
+        while queue or pending:
+            while queue and len(seen) < max_pages:
+                url = queue.pop(0)
+                if url in seen:
+                    continue
+                seen.add(url)
+                pending[executor.submit(fetch_page, session, throttle, url, start_url, extractor, keywords, end_time)] = url
+
+            if not pending:
+                break
+            remaining = end_time - time.monotonic()
+            if remaining <= 0:
+                logger.warning("Crawl-Deadline erreicht, %d Seite(n) verworfen", len(pending))
+                break
+
+            done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+            for future in done:
+                url = pending.pop(future)
+                try:
+                    dates, links = future.result()
+                except Exception as e:
+                    logger.warning("Fehler beim Crawlen von %s: %s", url, e)
+                    continue
+                closed_dates |= dates
+                queue.extend(link for link in links if link not in seen)
+    finally:
+        # Nicht auf laufende Requests warten, die Deadline gilt für den ganzen Crawl. Ihre
+        # Timeouts enden spätestens mit der Deadline; die Session wird erst danach geschlossen.
+        running = [future for future in pending if not future.cancel()]
+        executor.shutdown(wait=False)
+        if running:
+            def close_session(_future):
+                if all(future.done() for future in running):
+                    session.close()
+            for future in running:
+                future.add_done_callback(close_session)
+        else:
+            session.close()
+
+    return closed_dates
@@ -0,0 +1,34 @@
+"""
+gunicorn-Konfiguration für die Nippes-App.
+
+Die App wird im Master geladen (preload_app) und dort vor dem Fork
+aufgewärmt: Snapshot, kompiliertes Template und vorberechnete Antworten
+liegen danach im Speicher und werden von allen Workern copy-on-write
+geteilt. Erst danach beantwortet gunicorn Requests (/ready). Jeder Worker
+startet nach dem Fork seinen eigenen Crawl-Scheduler, der die Snapshots
+aller Venues aktuell hält.
+"""
+
+import gc
+
+bind = '0.0.0.0:5001'
+workers = 2
+# Mehrere Threads pro Worker, damit /debug/profile die übrigen Threads sampeln kann
+worker_class = 'gthread'
+threads = 4
+timeout = 30
+preload_app = True
+
+
+def when_ready(server):
+    """Wird im Master aufgerufen, nachdem die App geladen ist und bevor die Worker starten."""
+    import app
+    app.warm_up()
+    # Aufgewärmte Objekte aus der GC herausnehmen, damit die Worker ihre Seiten nicht kopieren
+    gc.freeze()
+
+
+def post_fork(server, worker):
+    """Startet im Worker den Crawl-Scheduler (Threads überleben den Fork nicht)."""
+    import app
+    app.scheduler.start()
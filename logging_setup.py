@@ -0,0 +1,139 @@
+"""
+Logging für Flask-App und Talk-Bot.
+
+Log-Einträge werden über einen QueueHandler an einen Hintergrund-Thread
+übergeben, der sie nach stderr (bzw. journald) schreibt. Request-Threads
+blockieren dadurch nie auf Log-I/O.
+
+Zusätzliche Felder werden über ``extra`` übergeben und als key=value an die
+Zeile angehängt::
+
+    logger.debug("Request", extra={'route': '/api/status', 'latency_ms': 1.2})
+
+Wiederkehrende Meldungen lassen sich mit ``extra={'rate_limit': 60}`` auf
+eine Zeile pro Intervall (Sekunden) und Kombination der übrigen Felder
+begrenzen (abweichend davon per ``rate_key``); unterdrückte Wiederholungen
+werden beim nächsten Eintrag als ``suppressed=N`` mitgezählt.
+"""
+
+import atexit
+import copy
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import time
+from threading import Lock
+
+LOG_LEVEL = os.environ.get('LOG_LEVEL', 'INFO').upper()
+LOG_FORMAT = '%(asctime)s %(levelname)s %(name)s: %(message)s'
+
+# Attribute, die jeder LogRecord hat; alles andere sind strukturierte Felder
+_RESERVED = set(vars(logging.LogRecord('', 0, '', 0, '', None, None))) | {'message', 'asctime', 'rate_limit', 'rate_key'}
+
+_handler = None
+_listener = None
+_pid = None
+
+
+class StructuredFormatter(logging.Formatter):
+    """Hängt die über ``extra`` übergebenen Felder als key=value an (vor einem Traceback)."""
+
+    def formatMessage(self, record):
+        line = super().formatMessage(record)
+        fields = {key: value for key, value in vars(record).items() if key not in _RESERVED}
+        if fields:
+            line += ' ' + ' '.join(f'{key}={value}' for key, value in fields.items())
+        return line
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """
+    Übergibt Tracebacks getrennt von der Meldung an den Writer-Thread.
+
+    Der QueueHandler der Standardbibliothek hängt den Traceback bereits an
+    ``msg`` an, die Felder stünden dann hinter der letzten Traceback-Zeile.
+    """
+
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self.formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class RateLimitFilter(logging.Filter):
+    """Lässt Meldungen mit ``rate_limit`` höchstens einmal pro Intervall durch."""
+
+    def __init__(self):
+        super().__init__()
+        self.lock = Lock()
+        self.last_emit = {}
+        self.suppressed = {}
+
+    def filter(self, record):
+        interval = getattr(record, 'rate_limit', None)
+        if not interval:
+            return True
+        # Strukturierte Felder gehören zum Schlüssel, damit z.B. jede Venue und jeder Raum eigene Zeilen bekommt;
+        # bei wechselnden Feldern (z.B. Response-Body) legt ``rate_key`` den Schlüssel fest
+        fields = getattr(record, 'rate_key', None)
+        if fields is None:
+            fields = tuple(sorted((key, str(value)) for key, value in vars(record).items() if key not in _RESERVED))
+        key = (record.name, record.levelno, record.msg, fields)
+        now = time.monotonic()
+        with self.lock:
+            if now - self.last_emit.get(key, float('-inf')) < interval:
+                self.suppressed[key] = self.suppressed.get(key, 0) + 1
+                return False
+            self.last_emit[key] = now
+            suppressed = self.suppressed.pop(key, 0)
+        if suppressed:
+            record.suppressed = suppressed
+        return True
+
+
+def _start_listener():
+    """Startet Queue und Writer-Thread für den aktuellen Prozess."""
+    global _listener, _pid
+    log_queue = queue.SimpleQueue()
+    _handler.queue = log_queue
+    stream_handler = logging.StreamHandler(sys.stderr)
+    stream_handler.setFormatter(StructuredFormatter(LOG_FORMAT))
+    _listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    _listener.start()
+    _pid = os.getpid()
+
+
+def _stop_listener():
+    if _listener is not None and _pid == os.getpid():
+        _listener.stop()
+
+
+def _after_fork():
+    # Der Writer-Thread existiert im Kindprozess nicht mehr (z.B. gunicorn-Worker)
+    if _handler is not None:
+        _start_listener()
+
+
+def setup_logging(level=LOG_LEVEL):
+    """Richtet das nicht-blockierende Logging ein. Mehrfache Aufrufe sind unschädlich."""
+    global _handler
+    if _handler is not None:
+        return
+    _handler = _QueueHandler(queue.SimpleQueue())
+    _handler.setFormatter(logging.Formatter())
+    _handler.addFilter(RateLimitFilter())
+    _start_listener()
+
+    root = logging.getLogger()
+    root.handlers[:] = [_handler]
+    root.setLevel(level)
+
+    atexit.register(_stop_listener)
+    if hasattr(os, 'register_at_fork'):
+        os.register_at_fork(after_in_child=_after_fork)
@@ -12,8 +12,20 @@ Voraussetzungen:
 import requests
 import time
 import json
+import logging
 import os
+import random
+import signal
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from threading import Condition, Lock, Thread
+
+import profiling
+from logging_setup import setup_logging
+
+logger = logging.getLogger('nippes.bot')
 
 # Lade .env Datei falls vorhanden
 def load_env_file():
@@ -44,6 +56,193 @@ NIPPES_API_URL = os.environ.get('NIPPES_API_URL', 'http://localhost:5001/api/sta
 # Trigger-Wörter, auf die der Bot reagiert
 TRIGGER_WORDS = ['nippes', 'ist das nippes offen', 'nippes status', 'ist das nippes geöffnet', 'nippes heute']
 
+# Befehle zum An- und Abmelden einer Konversation für Status-Broadcasts
+SUBSCRIBE_WORDS = ['nippes abo', 'nippes abonnieren']
+UNSUBSCRIBE_WORDS = ['nippes abo beenden', 'nippes abbestellen']
+
+# Broadcast-Konfiguration
+BROADCAST_TIME = os.environ.get('BROADCAST_TIME', '')  # z.B. "12:00", leer = kein täglicher Broadcast
+BROADCAST_ON_CHANGE = os.environ.get('BROADCAST_ON_CHANGE', 'true').lower() in ('1', 'true', 'yes')
+BROADCAST_CHECK_INTERVAL = int(os.environ.get('BROADCAST_CHECK_INTERVAL', '300'))  # Sekunden
+BOT_STATE_FILE = os.environ.get('BOT_STATE_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'bot_state.json'))
+
+def parse_broadcast_time(value):
+    """Wandelt BROADCAST_TIME ("HH:MM", z.B. "9:00") in eine Uhrzeit um; None, wenn leer oder ungültig."""
+    try:
+        return datetime.strptime(value, '%H:%M').time() if value else None
+    except ValueError:
+        return None
+
+BROADCAST_AT = parse_broadcast_time(BROADCAST_TIME)
+
+# Ausgehende Nachrichten (Warteschlange mit Retry und Ratenbegrenzung)
+SEND_RATE = float(os.environ.get('SEND_RATE', '2'))  # Nachrichten pro Sekunde (global)
+SEND_BURST = int(os.environ.get('SEND_BURST', '5'))  # Maximale Anzahl Nachrichten am Stück
+SEND_MAX_WORKERS = int(os.environ.get('SEND_MAX_WORKERS', '4'))  # Gleichzeitige Sends (verschiedene Räume)
+SEND_MAX_RETRIES = int(os.environ.get('SEND_MAX_RETRIES', '5'))
+SEND_BACKOFF_BASE = 1.0  # Sekunden
+SEND_BACKOFF_MAX = 60.0  # Sekunden
+SEND_QUEUE_LIMIT = 50  # Maximale Anzahl wartender Nachrichten pro Raum
+SEND_TIMEOUT = 10  # Timeout pro POST (Sekunden)
+
+class TokenBucket:
+    """Globale Ratenbegrenzung, die bei 429 komplett pausiert werden kann."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = float(capacity)
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+        self.lock = Lock()
+
+    def pause(self, seconds):
+        """Hält alle Sends für die angegebene Dauer an (z.B. wegen Retry-After)."""
+        with self.lock:
+            self.paused_until = max(self.paused_until, time.monotonic() + seconds)
+
+    def acquire(self):
+        """Blockiert, bis ein Token verfügbar ist, und verbraucht es."""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if now >= self.paused_until and self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = max(self.paused_until - now, (1 - self.tokens) / self.rate)
+            time.sleep(wait)
+
+class SendError(Exception):
+    """Fehlgeschlagener Send; retry_after ist gesetzt, wenn der Server eine Wartezeit vorgibt."""
+
+    def __init__(self, message, retryable, retry_after=None, rate_limited=False):
+        super().__init__(message)
+        self.retryable = retryable
+        self.retry_after = retry_after
+        self.rate_limited = rate_limited
+
+def parse_retry_after(value):
+    """Wertet einen Retry-After Header aus (Sekunden oder HTTP-Datum)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+class OutboundQueue:
+    """
+    Warteschlange für ausgehende Nachrichten.
+
+    Pro Raum wird immer nur eine Nachricht gleichzeitig gesendet, sodass die
+    Reihenfolge erhalten bleibt; verschiedene Räume werden parallel bedient.
+    Fehlgeschlagene Sends werden mit Jitter-Backoff bzw. nach Retry-After
+    wiederholt, ein globaler Token Bucket begrenzt die Gesamtrate.
+    """
+
+    def __init__(self, send_func, bucket, max_workers=SEND_MAX_WORKERS, max_retries=SEND_MAX_RETRIES):
+        self.send_func = send_func
+        self.bucket = bucket
+        self.max_retries = max_retries
+        self.rooms = {}  # token -> deque von [message, attempts]
+        self.ready_at = {}  # token -> frühester Zeitpunkt für den nächsten Versuch
+        self.in_flight = set()
+        self.cond = Condition()
+        self.executor = ThreadPoolExecutor(max_workers=max_workers)
+        self.dispatcher = Thread(target=self._dispatch, name='outbound-queue', daemon=True)
+        self.dispatcher.start()
+
+    def enqueue(self, token, message):
+        """Reiht eine Nachricht für einen Raum ein. Liefert False, wenn die Warteschlange voll ist."""
+        with self.cond:
+            room = self.rooms.setdefault(token, deque())
+            if len(room) >= SEND_QUEUE_LIMIT:
+                logger.warning("Warteschlange für Konversation %s voll, Nachricht verworfen", token)
+                return False
+            room.append([message, 0])
+            self.cond.notify()
+        return True
+
+    def pending(self):
+        """Anzahl noch nicht zugestellter Nachrichten."""
+        with self.cond:
+            return sum(len(room) for room in self.rooms.values())
+
+    def flush(self, timeout):
+        """Wartet bis alle Nachrichten zugestellt sind oder das Timeout abläuft."""
+        end_time = time.monotonic() + timeout
+        with self.cond:
+            while any(self.rooms.values()):
+                remaining = end_time - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self.cond.wait(remaining)
+        return True
+
+    def _next_room(self):
+        """Sucht einen sendebereiten Raum; liefert (token, Wartezeit)."""
+        now = time.monotonic()
+        wait = None
+        for token, room in self.rooms.items():
+            if not room or token in self.in_flight:
+                continue
+            delay = self.ready_at.get(token, 0.0) - now
+            if delay <= 0:
+                return token, 0
+            wait = delay if wait is None else min(wait, delay)
+        return None, wait
+
+    def _dispatch(self):
+        while True:
+            with self.cond:
+                token, wait = self._next_room()
+                while token is None:
+                    self.cond.wait(wait)
+                    token, wait = self._next_room()
+                self.in_flight.add(token)
+                item = self.rooms[token][0]
+            self.bucket.acquire()
+            self.executor.submit(self._deliver, token, item)
+
+    def _deliver(self, token, item):
+        message, attempts = item
+        error = None
+        try:
+            self.send_func(token, message)
+        except SendError as e:
+            error = e
+        except Exception as e:
+            error = SendError(str(e), retryable=True)
+
+        with self.cond:
+            room = self.rooms[token]
+            if error is None:
+                room.popleft()
+                self.ready_at.pop(token, None)
+            elif not error.retryable or attempts >= self.max_retries:
+                room.popleft()
+                self.ready_at.pop(token, None)
+                logger.error("Nachricht an Konversation %s nach %d Versuch(en) verworfen: %s", token, attempts + 1, error)
+            else:
+                item[1] = attempts + 1
+                backoff = random.uniform(0, min(SEND_BACKOFF_MAX, SEND_BACKOFF_BASE * 2 ** attempts))
+                delay = max(backoff, error.retry_after or 0)
+                self.ready_at[token] = time.monotonic() + delay
+                if error.rate_limited:
+                    # Rate-Limit gilt für den ganzen Bot-Account, nicht nur für den Raum
+                    self.bucket.pause(delay)
+                logger.warning("Senden an Konversation %s fehlgeschlagen (%s), neuer Versuch in %.1fs", token, error, delay)
+            if not room:
+                del self.rooms[token]
+            self.in_flight.discard(token)
+            self.cond.notify_all()
+
 class NextcloudTalkBot:
     def __init__(self):
         self.base_url = NEXTCLOUD_URL.rstrip('/')
@@ -58,6 +257,49 @@ class NextcloudTalkBot:
         })
         # Track bereits verarbeitete Nachrichten, um Doppelantworten zu vermeiden
         self.processed_messages = set()  # Set von (token, message_id) Tupeln
+        # Lokal gespeicherte Abos und Broadcast-Zustand
+        self.state_lock = Lock()
+        self.state = self.load_state()
+        self._last_broadcast_check = 0.0
+        self._daily_attempt = None  # Tag des letzten Versuchs für den täglichen Broadcast
+        # Ausgehende Nachrichten laufen über eine Warteschlange mit Retry
+        self.outbound = OutboundQueue(self.post_message, TokenBucket(SEND_RATE, SEND_BURST))
+    
+    def load_state(self):
+        """Lädt Abos und Broadcast-Zustand aus der State-Datei."""
+        state = {'subscriptions': [], 'closed_dates': None, 'last_daily_broadcast': None}
+        try:
+            if os.path.exists(BOT_STATE_FILE):
+                with open(BOT_STATE_FILE, 'r', encoding='utf-8') as f:
+                    state.update(json.load(f))
+        except Exception as e:
+            logger.warning("Fehler beim Laden der State-Datei: %s", e)
+        return state
+    
+    def save_state(self):
+        """Speichert Abos und Broadcast-Zustand atomar in der State-Datei."""
+        try:
+            tmp_file = f"{BOT_STATE_FILE}.tmp"
+            with open(tmp_file, 'w', encoding='utf-8') as f:
+                json.dump(self.state, f)
+            os.replace(tmp_file, BOT_STATE_FILE)
+        except Exception as e:
+            logger.error("Fehler beim Speichern der State-Datei: %s", e)
+    
+    def set_subscription(self, token, subscribed):
+        """Meldet eine Konversation für Broadcasts an oder ab."""
+        with self.state_lock:
+            subscriptions = set(self.state['subscriptions'])
+            if not subscriptions:
+                # Ohne Abonnenten wird die Liste nicht aktualisiert; sie neu aufbauen statt
+                # einen veralteten Stand als Änderung zu melden
+                self.state['closed_dates'] = None
+            if subscribed:
+                subscriptions.add(token)
+            else:
+                subscriptions.discard(token)
+            self.state['subscriptions'] = sorted(subscriptions)
+            self.save_state()
     
     def get_conversations(self):
         """Holt alle Konversationen des Bots."""
@@ -68,8 +310,8 @@ class NextcloudTalkBot:
             # Prüfe ob Antwort JSON ist
             content_type = response.headers.get('Content-Type', '')
             if 'application/json' not in content_type:
-                print(f"⚠ WARNUNG: Antwort ist kein JSON! Content-Type: {content_type}")
-                print(f"Erste 500 Zeichen der Antwort: {response.text[:500]}")
+                logger.warning("Antwort ist kein JSON! Content-Type: %s", content_type,
+                               extra={'body': repr(response.text[:500]), 'rate_limit': 300, 'rate_key': 'conversations'})
             
             response.raise_for_status()
             
@@ -77,23 +319,20 @@ class NextcloudTalkBot:
             try:
                 data = response.json()
             except json.JSONDecodeError as e:
-                print(f"⚠ JSON Parse Fehler: {e}")
-                print(f"Response Text: {response.text[:1000]}")
+                logger.warning("JSON Parse Fehler: %s", e, extra={'body': repr(response.text[:1000]), 'rate_limit': 300, 'rate_key': 'conversations'})
                 return []
             
             if 'ocs' in data and 'data' in data['ocs']:
                 return data['ocs']['data']
             else:
-                print(f"⚠ Unerwartete Antwort-Struktur: {data}")
+                logger.warning("Unerwartete Antwort-Struktur: %s", data, extra={'rate_limit': 300})
                 return []
         except requests.exceptions.HTTPError as e:
-            print(f"✗ HTTP Fehler beim Abrufen der Konversationen: {e}")
-            print(f"Response: {response.text[:500] if 'response' in locals() else 'Keine Antwort'}")
+            logger.error("HTTP Fehler beim Abrufen der Konversationen: %s", e,
+                         extra={'body': repr(response.text[:500]) if 'response' in locals() else '-', 'rate_limit': 300, 'rate_key': 'conversations'})
             return []
         except Exception as e:
-            print(f"✗ Fehler beim Abrufen der Konversationen: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.error("Fehler beim Abrufen der Konversationen: %s", e, exc_info=True, extra={'rate_limit': 300})
             return []
     
     def get_messages(self, token, limit=50):
@@ -143,11 +382,11 @@ class NextcloudTalkBot:
                     data = response.json()
                     if 'ocs' in data and 'data' in data['ocs']:
                         messages = data['ocs']['data']
-                        print(f"    → API {version} mit Parametern {params}: {len(messages)} Nachrichten gefunden")
+                        logger.debug("API %s mit Parametern %s: %d Nachrichten gefunden", version, params, len(messages))
                         return messages
                     elif isinstance(data, list):
                         # Manche APIs geben direkt eine Liste zurück
-                        print(f"    → API {version} mit Parametern {params}: {len(data)} Nachrichten gefunden (direkte Liste)")
+                        logger.debug("API %s mit Parametern %s: %d Nachrichten gefunden (direkte Liste)", version, params, len(data))
                         return data
                     else:
                         # Versuche nächste Parameter-Kombination
@@ -164,20 +403,35 @@ class NextcloudTalkBot:
                     continue
         
         # Alle Endpoints fehlgeschlagen
-        print(f"    → Alle API-Endpunkte fehlgeschlagen für {token}")
+        logger.warning("Alle API-Endpunkte fehlgeschlagen", extra={'room': token, 'rate_limit': 300})
         return []
     
     def send_message(self, token, message):
-        """Sendet eine Nachricht in eine Konversation."""
+        """Reiht eine Nachricht für eine Konversation in die Warteschlange ein."""
+        return self.outbound.enqueue(token, message)
+    
+    def post_message(self, token, message):
+        """Sendet eine Nachricht direkt; wirft SendError bei Fehlern."""
         url = f"{self.base_url}/ocs/v2.php/apps/spreed/api/v1/chat/{token}"
         data = {'message': message}
         try:
-            response = self.session.post(url, json=data)
-            response.raise_for_status()
-            return True
-        except Exception as e:
-            print(f"Fehler beim Senden der Nachricht: {e}")
-            return False
+            response = self.session.post(url, json=data, timeout=SEND_TIMEOUT)
+        except requests.exceptions.ConnectionError as e:
+            # Verbindung kam nicht zustande (inkl. ConnectTimeout), erneut versuchen
+            raise SendError(str(e), retryable=True)
+        except requests.exceptions.RequestException as e:
+            # Z.B. ReadTimeout: Die Nachricht wurde eventuell schon gepostet, ein Retry könnte sie doppeln
+            raise SendError(f"{e} (eventuell bereits zugestellt)", retryable=False)
+        
+        if response.status_code == 429:
+            raise SendError('HTTP 429 Too Many Requests', retryable=True,
+                            retry_after=parse_retry_after(response.headers.get('Retry-After')),
+                            rate_limited=True)
+        if response.status_code >= 500:
+            raise SendError(f'HTTP {response.status_code}', retryable=True,
+                            retry_after=parse_retry_after(response.headers.get('Retry-After')))
+        if response.status_code >= 400:
+            raise SendError(f'HTTP {response.status_code}', retryable=False)
     
     def get_nippes_status(self):
         """Holt den Nippes-Status von der API."""
@@ -186,7 +440,7 @@ class NextcloudTalkBot:
             response.raise_for_status()
             return response.json()
         except requests.exceptions.SSLError as e:
-            print(f"⚠ SSL-Fehler bei API-Aufruf: {e}")
+            logger.warning("SSL-Fehler bei API-Aufruf: %s", e, extra={'rate_limit': 60})
             # Versuche ohne SSL-Verifizierung
             try:
                 response = requests.get(NIPPES_API_URL, timeout=5, verify=False)
@@ -198,7 +452,7 @@ class NextcloudTalkBot:
                     'message': f'Fehler beim Abrufen des Status: {str(e2)}'
                 }
         except Exception as e:
-            print(f"⚠ Fehler beim API-Aufruf: {e}")
+            logger.warning("Fehler beim API-Aufruf: %s", e, extra={'rate_limit': 60})
             return {
                 'is_open': False,
                 'message': f'Fehler beim Abrufen des Status: {str(e)}'
@@ -262,57 +516,137 @@ class NextcloudTalkBot:
                     # Entferne die ältesten 500 Einträge
                     self.processed_messages = set(list(self.processed_messages)[500:])
                 
+                # Abo-Befehle (Abmelden zuerst prüfen, "nippes abo beenden" enthält "nippes abo")
+                subscribe = None
+                if any(word in message_text for word in UNSUBSCRIBE_WORDS):
+                    subscribe = False
+                elif any(word in message_text for word in SUBSCRIBE_WORDS):
+                    subscribe = True
+                if subscribe is not None:
+                    self.set_subscription(token, subscribe)
+                    if subscribe:
+                        reply = "🔔 Diese Konversation erhält jetzt automatische Nippes-Status-Meldungen."
+                    else:
+                        reply = "🔕 Automatische Nippes-Status-Meldungen für diese Konversation beendet."
+                    logger.info("Abo %s für Konversation %s (durch %s)", 'aktiviert' if subscribe else 'beendet', token, actor_display_name)
+                    return self.send_message(token, reply)
+                
                 # Prüfe ob API erreichbar ist
                 try:
                     test_response = requests.get(NIPPES_API_URL, timeout=2, verify=False)
                     if test_response.status_code != 200:
-                        print(f"⚠ API nicht erreichbar (Status {test_response.status_code}), überspringe Antwort")
-                        print(f"   URL: {NIPPES_API_URL}")
+                        logger.warning("API nicht erreichbar (Status %s), überspringe Antwort", test_response.status_code,
+                                       extra={'url': NIPPES_API_URL, 'rate_limit': 60})
                         continue
                 except requests.exceptions.SSLError as e:
-                    print(f"⚠ SSL-Fehler bei API-Aufruf: {e}, überspringe Antwort")
+                    logger.warning("SSL-Fehler bei API-Aufruf: %s, überspringe Antwort", e, extra={'rate_limit': 60})
                     continue
                 except Exception as e:
-                    print(f"⚠ API nicht erreichbar ({e}), überspringe Antwort")
+                    logger.warning("API nicht erreichbar (%s), überspringe Antwort", e, extra={'rate_limit': 60})
                     continue
                 
                 # Hole Status und antworte
                 status = self.get_nippes_status()
                 response_message = self.format_status_message(status)
                 if self.send_message(token, response_message):
-                    conv_info = f" ({conversation_name})" if conversation_name else ""
-                    print(f"✓ Antwort gesendet in Konversation {token}{conv_info} (auf Nachricht von {actor_display_name})")
+                    logger.info("Antwort eingereiht für Konversation %s (auf Nachricht von %s)", token, actor_display_name,
+                                extra={'room': conversation_name or '-'})
                     return True
                 else:
-                    print(f"✗ Fehler beim Senden der Antwort in Konversation {token}")
+                    logger.error("Antwort für Konversation %s konnte nicht eingereiht werden", token)
         
         return False
     
+    def broadcast(self, message):
+        """Reiht eine Nachricht für alle abonnierten Konversationen ein."""
+        with self.state_lock:
+            tokens = list(self.state['subscriptions'])
+        queued = sum(1 for token in tokens if self.send_message(token, message))
+        if tokens:
+            logger.info("Broadcast für %d/%d Konversation(en) eingereiht", queued, len(tokens))
+        return queued
+    
+    def check_broadcast(self):
+        """Prüft, ob ein täglicher oder änderungsbedingter Broadcast fällig ist, und sendet ihn."""
+        now = datetime.now()
+        today = now.date().isoformat()
+        with self.state_lock:
+            if not self.state['subscriptions']:
+                return
+            daily_due = BROADCAST_AT is not None and now.time() >= BROADCAST_AT \
+                and self.state.get('last_daily_broadcast') != today
+        
+        # Der tägliche Broadcast wird sofort versucht, Wiederholungen (z.B. API nicht erreichbar)
+        # laufen wie die Änderungsprüfung nur alle BROADCAST_CHECK_INTERVAL Sekunden
+        if time.time() - self._last_broadcast_check < BROADCAST_CHECK_INTERVAL \
+                and not (daily_due and self._daily_attempt != today):
+            return
+        self._last_broadcast_check = time.time()
+        if daily_due:
+            self._daily_attempt = today
+        
+        status = self.get_nippes_status()
+        if 'day' not in status:
+            # Fehlerantwort der API, nichts broadcasten
+            return
+        if status.get('crawl_ok') is False:
+            # Noch kein erfolgreicher Crawl, die Liste ist nicht aussagekräftig; nur den täglichen Status senden
+            if daily_due:
+                with self.state_lock:
+                    self.state['last_daily_broadcast'] = today
+                    self.save_state()
+                self.broadcast(self.format_status_message(status))
+            return
+        
+        # Vergangene Termine ignorieren, sonst gilt jeder verstrichene Termin als Änderung
+        closed_dates = sorted(
+            d for d in status.get('closed_dates', status.get('upcoming_closed', []))
+            if datetime.strptime(d, '%d.%m.%Y').date() >= now.date()
+        )
+        with self.state_lock:
+            previous = self.state.get('closed_dates')
+            if previous is not None:
+                previous = sorted(d for d in previous if datetime.strptime(d, '%d.%m.%Y').date() >= now.date())
+            changed = BROADCAST_ON_CHANGE and previous is not None and previous != closed_dates
+            self.state['closed_dates'] = closed_dates
+            if daily_due:
+                self.state['last_daily_broadcast'] = today
+            self.save_state()
+        
+        if not daily_due and not changed:
+            return
+        
+        # Nachricht einmal berechnen und an alle Abonnenten verteilen
+        message = self.format_status_message(status)
+        if changed:
+            message = "📢 Die geschlossenen Gesellschaften haben sich geändert!\n\n" + message
+        self.broadcast(message)
+    
     def run(self):
         """Hauptschleife des Bots."""
-        print(f"Bot gestartet für Benutzer: {self.username}")
-        print(f"Nextcloud URL: {self.base_url}")
-        print(f"Nippes API: {NIPPES_API_URL}")
-        print("Bot läuft... Drücke Ctrl+C zum Beenden")
-        print()
+        logger.info("Bot gestartet für Benutzer: %s", self.username,
+                    extra={'nextcloud': self.base_url, 'api': NIPPES_API_URL})
         
         last_check = {}
         error_count = {}
         
         try:
             while True:
+                try:
+                    self.check_broadcast()
+                except Exception as e:
+                    logger.error("Fehler beim Broadcast: %s", e, exc_info=True, extra={'rate_limit': 300})
+                
                 conversations = self.get_conversations()
                 
                 if not conversations:
-                    print("⚠ Keine Konversationen gefunden. Stelle sicher, dass der Bot Mitglied in Talk-Konversationen ist.")
+                    logger.warning("Keine Konversationen gefunden. Stelle sicher, dass der Bot Mitglied in Talk-Konversationen ist.",
+                                   extra={'rate_limit': 600})
                     time.sleep(30)  # Warte länger wenn keine Konversationen
                     continue
                 
-                # Zeige Status nur alle 60 Sekunden, um Logs ruhiger zu halten
-                current_time = time.time()
-                if not hasattr(self, '_last_status_time') or current_time - self._last_status_time > 60:
-                    print(f"✓ Überwache {len(conversations)} Konversation(en)...")
-                    self._last_status_time = current_time
+                # Zeige Status nur alle 10 Minuten, um Logs ruhiger zu halten
+                logger.info("Überwache %d Konversation(en)", len(conversations), extra={'rate_limit': 600})
                 
                 for conv in conversations:
                     token = conv.get('token')
@@ -330,11 +664,10 @@ class NextcloudTalkBot:
                     # Überspringe Konversationen mit zu vielen Fehlern
                     if error_count.get(token, 0) > 10:
                         if error_count[token] == 11:  # Nur einmal warnen
-                            print(f"⚠ Überspringe Konversation {token} ({name}) wegen wiederholter Fehler")
+                            logger.warning("Überspringe Konversation %s (%s) wegen wiederholter Fehler", token, name)
                         continue
                     
-                    # Debug: Zeige welche Konversation geprüft wird
-                    print(f"\nPrüfe Konversation: {name} (Typ: {conv_type}, Token: {token})")
+                    logger.debug("Prüfe Konversation: %s (Typ: %s, Token: %s)", name, conv_type, token)
                     
                     try:
                         if self.check_and_respond(token, name):
@@ -346,9 +679,7 @@ class NextcloudTalkBot:
                     except Exception as e:
                         error_count[token] = error_count.get(token, 0) + 1
                         if error_count[token] <= 3:  # Nur erste Fehler ausgeben
-                            print(f"✗ Fehler in Konversation {token} ({name}): {e}")
-                        import traceback
-                        traceback.print_exc()
+                            logger.error("Fehler in Konversation %s (%s): %s", token, name, e, exc_info=True)
                     
                     last_check[token] = time.time()
                 
@@ -356,14 +687,22 @@ class NextcloudTalkBot:
                 time.sleep(5)
                 
         except KeyboardInterrupt:
-            print("\nBot wird beendet...")
+            logger.info("Bot wird beendet...")
+            if not self.outbound.flush(timeout=10):
+                logger.warning("%d Nachricht(en) nicht mehr zugestellt", self.outbound.pending())
         except Exception as e:
-            print(f"Fehler in der Hauptschleife: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.exception("Fehler in der Hauptschleife: %s", e)
+
+def handle_sigterm(signum, frame):
+    """Behandelt SIGTERM (systemctl stop) wie Strg+C, damit die Sende-Warteschlange noch geleert wird."""
+    raise KeyboardInterrupt
 
 def main():
     """Hauptfunktion."""
+    setup_logging()
+    # Stack-Samples per "kill -USR2 <pid>" nach PROFILE_DIR
+    profiling.install_signal_handler()
+    
     # Prüfe Konfiguration
     if not BOT_PASSWORD:
         print("FEHLER: BOT_PASSWORD nicht gesetzt!")
@@ -373,6 +712,9 @@ def main():
         print("export NEXTCLOUD_URL='https://deine-nextcloud.de'")
         print("export NIPPES_API_URL='http://localhost:5001/api/status'")
         return 1
+    if BROADCAST_TIME and BROADCAST_AT is None:
+        print(f"FEHLER: Ungültige BROADCAST_TIME '{BROADCAST_TIME}', erwartet HH:MM (z.B. 12:00)")
+        return 1
     
     # Zeige Konfiguration (ohne Passwort)
     print("=== Bot Konfiguration ===")
@@ -380,6 +722,7 @@ def main():
     print(f"Bot Username: {BOT_USERNAME}")
     print(f"Bot Password: {'*' * len(BOT_PASSWORD) if BOT_PASSWORD else 'NICHT GESETZT'}")
     print(f"Nippes API URL: {NIPPES_API_URL}")
+    print(f"Broadcast: täglich {BROADCAST_AT.strftime('%H:%M') if BROADCAST_AT else 'aus'}, bei Änderungen {'an' if BROADCAST_ON_CHANGE else 'aus'}")
     print("=" * 30)
     print()
     
@@ -400,6 +743,7 @@ def main():
         return 1
     
     print()
+    signal.signal(signal.SIGTERM, handle_sigterm)
     bot.run()
     return 0
 
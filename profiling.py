@@ -0,0 +1,175 @@
+"""
+Optionales Profiling für Flask-App und Talk-Bot.
+
+- sample_stacks(): Sampelt für N Sekunden die Stacks aller Threads des
+  laufenden Prozesses und liefert sie im "folded"-Format
+  (``frame;frame;frame anzahl``), das direkt von flamegraph.pl bzw.
+  speedscope gelesen werden kann.
+- install_signal_handler(): Startet bei einem Signal (Standard: SIGUSR2)
+  eine Sampling-Runde im Hintergrund und schreibt das Ergebnis nach
+  PROFILE_DIR (für den Talk-Bot).
+- init_app(): Registriert für die Flask-App den geschützten Endpoint
+  ``/debug/profile?seconds=N`` sowie cProfile pro Request über den Header
+  ``X-Profile``. Beides ist nur aktiv, wenn PROFILE_TOKEN gesetzt ist; ohne
+  Token werden weder Hooks noch Routen registriert.
+
+Solange kein Profiling angefordert wird, entsteht kein Overhead. Der
+Endpoint sampelt die anderen Threads des Workers und braucht daher einen
+Worker mit mehreren Threads (gunicorn ``--worker-class gthread``).
+"""
+
+import cProfile
+import hmac
+import io
+import logging
+import os
+import pstats
+import signal
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+
+logger = logging.getLogger(__name__)
+
+PROFILE_TOKEN = os.environ.get('PROFILE_TOKEN', '')
+PROFILE_DIR = os.environ.get('PROFILE_DIR', tempfile.gettempdir())
+SAMPLE_INTERVAL = 0.005   # Sekunden zwischen zwei Samples
+MAX_SAMPLE_SECONDS = 25   # Obergrenze für eine Sampling-Runde (unter dem gunicorn-Timeout)
+DEFAULT_SAMPLE_SECONDS = 10
+
+_sampling_lock = threading.Lock()
+# cProfile kann pro Prozess nur einmal gleichzeitig aktiv sein (ab Python 3.12 sonst ValueError)
+_request_profile_lock = threading.Lock()
+
+
+def _folded_stack(frame):
+    """Wandelt einen Frame in einen folded Stack (äußerster Frame zuerst) um."""
+    names = []
+    while frame is not None:
+        code = frame.f_code
+        names.append(f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})")
+        frame = frame.f_back
+    return ';'.join(reversed(names))
+
+
+def sample_stacks(seconds, interval=SAMPLE_INTERVAL):
+    """
+    Sampelt die Stacks aller anderen Threads für ``seconds`` Sekunden.
+
+    Liefert den Text im folded-Format oder None, wenn bereits eine
+    Sampling-Runde läuft.
+    """
+    seconds = min(max(seconds, 0), MAX_SAMPLE_SECONDS)
+    if not _sampling_lock.acquire(blocking=False):
+        return None
+    try:
+        own_id = threading.get_ident()
+        names = {thread.ident: thread.name for thread in threading.enumerate()}
+        counts = Counter()
+        end_time = time.monotonic() + seconds
+        while time.monotonic() < end_time:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+                thread_name = names.get(thread_id, str(thread_id))
+                counts[f"{thread_name};{_folded_stack(frame)}"] += 1
+            time.sleep(interval)
+    finally:
+        _sampling_lock.release()
+    return ''.join(f"{stack} {count}\n" for stack, count in counts.most_common())
+
+
+def _profile_path(prefix, suffix):
+    """Liefert einen eindeutigen Dateinamen in PROFILE_DIR."""
+    return os.path.join(PROFILE_DIR, f"{prefix}-{os.getpid()}-{time.time_ns() // 1_000_000}{suffix}")
+
+
+def install_signal_handler(signum=getattr(signal, 'SIGUSR2', None), seconds=DEFAULT_SAMPLE_SECONDS):
+    """Startet bei ``signum`` eine Sampling-Runde in einem Hintergrund-Thread."""
+    if signum is None:
+        return False
+
+    def run():
+        stacks = sample_stacks(seconds)
+        if stacks is None:
+            logger.warning("Profiling läuft bereits, Signal ignoriert")
+            return
+        filename = _profile_path('stacks', '.folded')
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(stacks)
+        logger.info("Stack-Samples geschrieben: %s", filename)
+
+    def handler(signum, frame):
+        threading.Thread(target=run, name='profiler', daemon=True).start()
+
+    signal.signal(signum, handler)
+    return True
+
+
+def _authorized(value):
+    return bool(value) and hmac.compare_digest(value, PROFILE_TOKEN)
+
+
+def init_app(app):
+    """Registriert Profiling-Endpoint und Request-Profiling, falls PROFILE_TOKEN gesetzt ist."""
+    if not PROFILE_TOKEN:
+        return False
+
+    from flask import Response, abort, g, request
+
+    @app.route('/debug/profile')
+    def debug_profile():
+        """Sampelt den Worker-Prozess und liefert die Stacks im folded-Format."""
+        if not _authorized(request.headers.get('X-Profile-Token', '')):
+            abort(404)
+        seconds = request.args.get('seconds', DEFAULT_SAMPLE_SECONDS, type=float)
+        stacks = sample_stacks(seconds)
+        if stacks is None:
+            return Response('Profiling läuft bereits\n', status=409, mimetype='text/plain')
+        return Response(stacks, mimetype='text/plain')
+
+    @app.before_request
+    def start_request_profile():
+        if not _authorized(request.headers.get('X-Profile', '')):
+            return
+        if not _request_profile_lock.acquire(blocking=False):
+            # Ein anderer Request wird gerade profiliert; diesen normal beantworten
+            logger.info("Request-Profiling läuft bereits, %s wird nicht profiliert", request.path)
+            return
+        g.profiler = cProfile.Profile()
+        try:
+            g.profiler.enable()
+        except ValueError:
+            # Anderes Profiling-Tool aktiv (z.B. sys.monitoring)
+            g.pop('profiler')
+            _request_profile_lock.release()
+
+    @app.after_request
+    def stop_request_profile(response):
+        profiler = g.pop('profiler', None)
+        if profiler is None:
+            return response
+        profiler.disable()
+        _request_profile_lock.release()
+        stats_file = _profile_path('request', '.prof')
+        profiler.dump_stats(stats_file)
+        # Top 15 nach kumulativer Zeit ins Debug-Log, Details in der .prof-Datei
+        summary = io.StringIO()
+        pstats.Stats(profiler, stream=summary).sort_stats('cumulative').print_stats(15)
+        logger.info("Request-Profil für %s geschrieben: %s", request.path, stats_file)
+        logger.debug(summary.getvalue())
+        response.headers['X-Profile-File'] = stats_file
+        return response
+
+    @app.teardown_request
+    def release_request_profile(exc):
+        # Falls after_request nicht lief, Profiler trotzdem beenden und Lock freigeben
+        profiler = g.pop('profiler', None)
+        if profiler is not None:
+            profiler.disable()
+            _request_profile_lock.release()
+
+    logger.warning("Profiling aktiviert (PROFILE_TOKEN gesetzt)")
+    return True
@@ -1,6 +1,9 @@
 #!/bin/bash
 # Script zum Neustarten der Flask-App
 
+echo "Baue statische Assets..."
+/root/nippes/.venv/bin/python /root/nippes/build_assets.py
+
 echo "Stoppe Flask-App..."
 systemctl stop nippes.service
 
@@ -10,8 +13,13 @@ sleep 2
 echo "Starte Flask-App neu..."
 systemctl start nippes.service
 
-echo "Warte 3 Sekunden..."
-sleep 3
+echo "Warte auf Warm-up..."
+for i in $(seq 1 30); do
+    if curl -sf --max-time 2 http://localhost:5001/ready > /dev/null; then
+        break
+    fi
+    sleep 1
+done
 
 echo "Prüfe Status..."
 systemctl status nippes.service --no-pager
@@ -1,60 +1,120 @@
-const CACHE_NAME = 'nippes-status-v1';
-const urlsToCache = [
-  '/',
-  '/static/icon-192.png',
-  '/static/icon-512.png',
-  '/static/manifest.json'
-];
-
-// Install Event - Cache Resources
+// Version und Precache-Liste werden von build_assets.py eingesetzt
+const CACHE_VERSION = /*__BUILD_VERSION__*/'dev';
+const PRECACHE_URLS = /*__PRECACHE_URLS__*/[];
+
+const STATIC_CACHE = `nippes-static-${CACHE_VERSION}`;
+const PAGE_CACHE = `nippes-pages-${CACHE_VERSION}`;
+
+// Routen mit Stale-While-Revalidate, alles unter /assets/ ist gehasht und unveränderlich
+const REVALIDATE_ROUTES = ['/', '/api/status'];
+const REVALIDATE_PREFIXES = ['/venues/', '/api/status/'];
+const FETCHED_AT_HEADER = 'X-SW-Fetched-At';
+
+// Install Event - Precache Startseite und gehashte Assets
 self.addEventListener('install', (event) => {
   event.waitUntil(
-    caches.open(CACHE_NAME)
-      .then((cache) => {
-        return cache.addAll(urlsToCache);
-      })
+    Promise.all([
+      caches.open(STATIC_CACHE).then((cache) => cache.addAll(PRECACHE_URLS)),
+      caches.open(PAGE_CACHE).then((cache) => revalidate(cache, new Request('/'), undefined))
+    ]).then(() => self.skipWaiting())
   );
 });
 
-// Fetch Event - Serve from Cache, fallback to Network
-self.addEventListener('fetch', (event) => {
-  event.respondWith(
-    caches.match(event.request)
-      .then((response) => {
-        // Cache hit - return response
-        if (response) {
-          return response;
-        }
-        // Clone the request
-        const fetchRequest = event.request.clone();
-        return fetch(fetchRequest).then((response) => {
-          // Check if valid response
-          if (!response || response.status !== 200 || response.type !== 'basic') {
-            return response;
-          }
-          // Clone the response
-          const responseToCache = response.clone();
-          caches.open(CACHE_NAME).then((cache) => {
-            cache.put(event.request, responseToCache);
-          });
-          return response;
-        });
-      })
-  );
-});
-
-// Activate Event - Clean up old caches
+// Activate Event - Caches anderer Versionen entfernen
 self.addEventListener('activate', (event) => {
   event.waitUntil(
     caches.keys().then((cacheNames) => {
       return Promise.all(
         cacheNames.map((cacheName) => {
-          if (cacheName !== CACHE_NAME) {
+          if (cacheName !== STATIC_CACHE && cacheName !== PAGE_CACHE) {
             return caches.delete(cacheName);
           }
         })
       );
-    })
+    }).then(() => self.clients.claim())
   );
 });
 
+self.addEventListener('fetch', (event) => {
+  const url = new URL(event.request.url);
+  if (event.request.method !== 'GET' || url.origin !== self.location.origin) {
+    return;
+  }
+  if (url.pathname.startsWith('/assets/')) {
+    event.respondWith(cacheFirst(event.request));
+  } else if (REVALIDATE_ROUTES.includes(url.pathname) || REVALIDATE_PREFIXES.some((prefix) => url.pathname.startsWith(prefix))) {
+    event.respondWith(staleWhileRevalidate(event));
+  }
+  // Alles andere geht ohne Service Worker direkt ans Netzwerk
+});
+
+// Gehashte Assets ändern sich nie: Cache zuerst, Netzwerk nur beim ersten Mal
+async function cacheFirst(request) {
+  const cached = await caches.match(request);
+  if (cached) {
+    return cached;
+  }
+  const response = await fetch(request);
+  if (response.ok) {
+    const cache = await caches.open(STATIC_CACHE);
+    await cache.put(request, response.clone());
+  }
+  return response;
+}
+
+// Status-Seite und API: heutige Kopie sofort ausliefern und im Hintergrund per ETag
+// prüfen. Kopien vom Vortag sind für die Frage "heute geöffnet?" falsch, dann zuerst
+// das Netzwerk fragen und die alte Kopie nur offline zeigen.
+async function staleWhileRevalidate(event) {
+  const cache = await caches.open(PAGE_CACHE);
+  const cached = await cache.match(event.request.url);
+  const network = revalidate(cache, event.request, cached);
+
+  if (cached && fetchedToday(cached)) {
+    event.waitUntil(network.catch(() => undefined));
+    return cached;
+  }
+  try {
+    return await network;
+  } catch (error) {
+    if (cached) {
+      return cached;
+    }
+    throw error;
+  }
+}
+
+// Fragt das Netzwerk mit If-None-Match; bei 304 bleibt der Body aus dem Cache
+async function revalidate(cache, request, cached) {
+  const headers = new Headers({ 'Accept': request.headers.get('Accept') || '*/*' });
+  const etag = cached && cached.headers.get('ETag');
+  if (etag) {
+    headers.set('If-None-Match', etag);
+  }
+  const response = await fetch(request.url, { headers, cache: 'no-store', credentials: 'same-origin' });
+
+  if (response.status === 304 && cached) {
+    const refreshed = await stamp(cached);
+    await cache.put(request.url, refreshed.clone());
+    return refreshed;
+  }
+  if (response.ok) {
+    const stamped = await stamp(response);
+    await cache.put(request.url, stamped.clone());
+    return stamped;
+  }
+  return response;
+}
+
+// Merkt sich, wann die Antwort zuletzt vom Server bestätigt wurde
+async function stamp(response) {
+  const headers = new Headers(response.headers);
+  headers.set(FETCHED_AT_HEADER, new Date().toISOString());
+  const body = await response.blob();
+  return new Response(body, { status: response.status, statusText: response.statusText, headers });
+}
+
+function fetchedToday(response) {
+  const fetchedAt = response.headers.get(FETCHED_AT_HEADER);
+  return Boolean(fetchedAt) && new Date(fetchedAt).toDateString() === new Date().toDateString();
+}
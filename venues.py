@@ -0,0 +1,181 @@
+"""
+Venue-Registry.
+
+Eine Venue beschreibt, wo ihre Termine stehen (Start-URL, Extractor-Plugin,
+Links, denen gefolgt wird), wann sie regulär geöffnet hat und wie oft sie
+neu gecrawlt wird. Das Nippes ist fest registriert; weitere Venues kommen
+aus einer JSON-Datei (VENUES_FILE, Standard: venues.json neben app.py)::
+
+    [
+        {
+            "slug": "beispiel",
+            "name": "Beispiel-Bar",
+            "start_url": "https://www.beispiel-bar.de/",
+            "opening_days": [3, 4, 5],
+            "crawl_interval_hours": 12,
+            "extractor": "geschlossen"
+        }
+    ]
+
+Als Extractor kann ein registrierter Name (siehe EXTRACTORS) oder eine
+Liste eigener Regex-Patterns mit den Gruppen day, month und year
+(``"patterns": [...]``) angegeben werden.
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime
+
+from crawler import PAGE_KEYWORDS, START_URL, extract_closed_dates
+
+logger = logging.getLogger(__name__)
+
+VENUES_FILE = os.environ.get('VENUES_FILE', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'venues.json'))
+DEFAULT_VENUE = os.environ.get('DEFAULT_VENUE', 'nippes')
+
+# Der Slug wird Teil von URLs und Dateinamen (Cache-Datei)
+SLUG_PATTERN = re.compile(r'[a-z0-9-]+')
+
+WEEKDAY_NAMES = ['Montag', 'Dienstag', 'Mittwoch', 'Donnerstag', 'Freitag', 'Samstag', 'Sonntag']
+
+
+def regex_extractor(patterns):
+    """
+    Baut einen Extractor aus Regex-Patterns mit den Gruppen day, month und year.
+
+    Zweistellige Jahre werden als 20YY interpretiert.
+    """
+    compiled = [re.compile(pattern, re.IGNORECASE) for pattern in patterns]
+
+    def extract(text):
+        closed_dates = set()
+        for pattern in compiled:
+            for match in pattern.finditer(text):
+                year = int(match.group('year'))
+                if year < 100:
+                    year += 2000
+                try:
+                    closed_dates.add(datetime(year, int(match.group('month')), int(match.group('day'))).date())
+                except ValueError:
+                    # Ungültiges Datum überspringen
+                    continue
+        return closed_dates
+
+    return extract
+
+
+# Extractor-Plugins: Name -> Funktion(text) -> Menge geschlossener Daten
+EXTRACTORS = {
+    # "DD.MM.YY geschlossen" bzw. "DD.MM.YY geschlossene Gesellschaft" (Nippes)
+    'geschlossen': extract_closed_dates,
+}
+
+
+def register_extractor(name, extractor):
+    """Registriert ein Extractor-Plugin unter einem Namen."""
+    EXTRACTORS[name] = extractor
+
+
+def format_days(days):
+    """Beschreibt Wochentage lesbar, z.B. "Mittwoch bis Samstag" oder "Montag und Freitag"."""
+    days = sorted(days)
+    if len(days) > 2 and days == list(range(days[0], days[-1] + 1)):
+        return f"{WEEKDAY_NAMES[days[0]]} bis {WEEKDAY_NAMES[days[-1]]}"
+    names = [WEEKDAY_NAMES[day] for day in days]
+    if len(names) > 1:
+        return f"{', '.join(names[:-1])} und {names[-1]}"
+    return ''.join(names)
+
+
+class Venue:
+    """Eine Location mit eigenem Crawl, Öffnungstagen und Snapshot."""
+
+    def __init__(self, slug, name, start_url, extractor=extract_closed_dates, opening_days=(2, 3, 4, 5),
+                 crawl_interval_hours=24, keywords=PAGE_KEYWORDS, website=None, open_message=None):
+        if not isinstance(slug, str) or not SLUG_PATTERN.fullmatch(slug):
+            raise ValueError(f"Ungültiger Slug {slug!r} (erlaubt: a-z, 0-9 und -)")
+        self.slug = slug
+        self.name = name
+        self.start_url = start_url
+        self.extractor = extractor
+        self.opening_days = frozenset(opening_days)  # 0 = Montag, 6 = Sonntag
+        self.crawl_interval_hours = crawl_interval_hours
+        self.keywords = tuple(keywords)
+        self.website = website or start_url
+        self.opening_hours = format_days(self.opening_days)
+        self.open_message = open_message or f"{name} ist heute geöffnet, viel Spaß damit!"
+
+    def is_open(self, day, closed_dates):
+        """Prüft, ob die Venue an ``day`` geöffnet ist; liefert (offen, Nachricht)."""
+        if day.weekday() not in self.opening_days:
+            return False, f"Heute ist nicht {self.opening_hours}"
+
+        # Prüfe auf geschlossene Gesellschaften
+        if day in closed_dates:
+            return False, "Heute ist geschlossene Gesellschaft"
+
+        return True, self.open_message
+
+    @classmethod
+    def from_config(cls, config):
+        """Erstellt eine Venue aus einem Eintrag der VENUES_FILE."""
+        if 'patterns' in config:
+            extractor = regex_extractor(config['patterns'])
+        else:
+            extractor = EXTRACTORS[config.get('extractor', 'geschlossen')]
+        return cls(
+            slug=config['slug'],
+            name=config['name'],
+            start_url=config['start_url'],
+            extractor=extractor,
+            opening_days=config.get('opening_days', (2, 3, 4, 5)),
+            crawl_interval_hours=config.get('crawl_interval_hours', 24),
+            keywords=config.get('keywords', PAGE_KEYWORDS),
+            website=config.get('website'),
+            open_message=config.get('open_message'),
+        )
+
+
+VENUES = {}
+
+
+def register_venue(venue):
+    """Registriert eine Venue unter ihrem Slug."""
+    VENUES[venue.slug] = venue
+    return venue
+
+
+def get_venue(slug=None):
+    """Liefert die Venue zum Slug (ohne Slug die Standard-Venue) oder None."""
+    return VENUES.get(slug or DEFAULT_VENUE)
+
+
+def load_venues_file(path=VENUES_FILE):
+    """Registriert alle Venues aus der JSON-Konfiguration, falls vorhanden."""
+    if not os.path.exists(path):
+        return 0
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            configs = json.load(f)
+    except Exception as e:
+        logger.error("Fehler beim Laden der Venue-Konfiguration %s: %s", path, e)
+        return 0
+
+    loaded = 0
+    for config in configs:
+        try:
+            register_venue(Venue.from_config(config))
+            loaded += 1
+        except Exception as e:
+            logger.error("Ungültige Venue-Konfiguration %s: %s", config.get('slug', '?'), e)
+    return loaded
+
+
+register_venue(Venue(
+    slug='nippes',
+    name='Nippes',
+    start_url=START_URL,
+    open_message="Das Nippes ist heute geöffnet, viel Spaß damit!",
+))